@@ -1,59 +1,357 @@
 #!/usr/bin/env python3
 import requests
 import os
-import PyPDF2
+import pikepdf
 import time
 import subprocess
 import shutil
+import tempfile
 import argparse
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 from urllib.parse import urljoin
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import asyncio
+import heapq
+import bisect
+import contextlib
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+try:
+    # Optional in-process Ghostscript binding (python-ghostscript)
+    import ghostscript._gsprint as gsapi
+except (ImportError, RuntimeError, OSError):
+    # Not installed, or installed but libgs itself can't be found/loaded
+    gsapi = None
+
+# This process's libgs interpreter as (pid, init args, instance), kept warm between files
+_gs_instance = None
+
+# Bytes per megabyte/gigabyte, for size reporting and thresholds
+_MB = 1 << 20
+_GB = 1 << 30
+
+def _ps_string(value):
+    """Quote a string as a PostScript string literal."""
+    return '(' + value.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+def _absolute_jobs(jobs):
+    """Make the paths in (input, output) pairs absolute."""
+    return [(os.path.abspath(input_file), os.path.abspath(output_file)) for input_file, output_file in jobs]
+
+def _libgs_instance(init_args):
+    """Return this process's warm libgs interpreter for init_args, creating it if needed.
+    
+    Returns None if libgs refuses to create another interpreter.
+    """
+    global _gs_instance
+    # A forked worker inherits the parent's record, but not a usable interpreter
+    if _gs_instance is not None and _gs_instance[0] != os.getpid():
+        _gs_instance = None
+    if _gs_instance is not None and _gs_instance[1] == init_args:
+        return _gs_instance[2]
+    _drop_libgs_instance()
+    
+    try:
+        instance = gsapi.new_instance()
+    except gsapi.GhostscriptError:
+        return None
+    try:
+        gsapi.init_with_args(instance, [os.fsencode(arg) for arg in init_args])
+    except gsapi.GhostscriptError:
+        gsapi.delete_instance(instance)
+        return None
+    _gs_instance = (os.getpid(), init_args, instance)
+    return instance
+
+def _drop_libgs_instance():
+    """Shut down this process's libgs interpreter, if it has one."""
+    global _gs_instance
+    if _gs_instance is None:
+        return
+    instance = _gs_instance[2]
+    _gs_instance = None
+    try:
+        gsapi.exit(instance)
+    except gsapi.GhostscriptError:
+        pass
+    gsapi.delete_instance(instance)
+
+def _compress_batch_libgs(jobs, init_args):
+    """Compress (input, output) pairs through this process's in-process Ghostscript.
+    
+    Returns one success flag per job, or None if no interpreter was available.
+    """
+    outcomes = []
+    for input_file, output_file in jobs:
+        instance = _libgs_instance(init_args)
+        if instance is None:
+            return None if not outcomes else outcomes + [False] * (len(jobs) - len(outcomes))
+        
+        # Switching OutputFile back to the null device finishes writing the output
+        program = (f'<< /OutputFile {_ps_string(output_file)} >> setpagedevice {_ps_string(input_file)} run '
+                   f'<< /OutputFile {_ps_string(os.devnull)} >> setpagedevice')
+        try:
+            gsapi.run_string(instance, os.fsencode(program))
+            outcomes.append(True)
+        except gsapi.GhostscriptError:
+            # The interpreter state is unknown after an error, so start fresh for the next file
+            _drop_libgs_instance()
+            outcomes.append(False)
+    return outcomes
 
 class PDFTools:
     """A comprehensive tool for downloading, merging, and compressing PDF files."""
     
-    def __init__(self):
-        """Initialize the PDFTools class."""
+    # Links that point at a PDF, optionally followed by a query string
+    _PDF_HREF_RE = re.compile(r'\.pdf(?:$|\?)', re.IGNORECASE)
+    # The same filter as an XPath query, so lxml selects the links in C
+    _PDF_HREF_XPATH = f"//a[re:test(@href, '{_PDF_HREF_RE.pattern}', 'i')]/@href"
+    # A 206 response's Content-Range header: first byte, last byte and total size
+    _CONTENT_RANGE_RE = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+    # Characters that aren't safe to keep in a downloaded filename
+    _FILENAME_SANITIZE = re.compile(r'[^a-zA-Z0-9._-]')
+    
+    # Files larger than this are fetched as parallel byte ranges when the server allows it
+    RANGED_DOWNLOAD_THRESHOLD = 8 * _MB
+    # Number of parallel range requests per large file
+    RANGED_DOWNLOAD_PARTS = 4
+    # Records ETag/Last-Modified of past downloads so re-runs can skip unchanged files
+    MANIFEST_NAME = '.download_manifest.json'
+    # Buffer size used when streaming downloads to disk
+    DOWNLOAD_CHUNK_SIZE = _MB
+    
+    # Number of inputs written to each intermediate file before the final join
+    MERGE_FLUSH_EVERY = 50
+    
+    QUALITY_SETTINGS = {
+        'screen': '/screen',  # 72 dpi - lowest quality, smallest size
+        'ebook': '/ebook',    # 150 dpi - medium quality, good size
+        'printer': '/printer',  # 300 dpi - better quality, larger size
+        'prepress': '/prepress'  # 300 dpi - best quality, largest size
+    }
+    
+    def __init__(self, max_workers=10, num_retries=3, verbose=True):
+        """Initialize the PDFTools class.
+        
+        With verbose=False the per-file progress lines are not printed, which
+        keeps stdout out of the hot path when processing thousands of files.
+        Summaries, warnings and errors are always printed.
+        """
+        self.verbose = verbose
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36'
         }
+        
+        # Shared session so connections (and TLS handshakes) are reused across downloads
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Advertise every content encoding urllib3 can decode here (br/zstd when
+        # brotli/zstandard are installed), not just requests' default gzip/deflate
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        retries = Retry(total=num_retries, backoff_factor=2, status_forcelist=[502, 503, 504])
+        # Each download worker may fetch RANGED_DOWNLOAD_PARTS ranges at once, so size the
+        # pool for that; otherwise urllib3 discards the surplus connections
+        adapter = HTTPAdapter(pool_connections=max_workers,
+                              pool_maxsize=max_workers * self.RANGED_DOWNLOAD_PARTS,
+                              max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._gs_warmed = False
+    
+    def _progress(self, message):
+        """Print a per-file progress message unless running quietly."""
+        if self.verbose:
+            print(message)
     
     # ==================== DOWNLOAD FUNCTIONS ====================
     
-    def download_pdf(self, pdf_url, download_dir, session, num_retries=3):
-        """Download a single PDF file with retry logic."""
-        # Get the filename from the URL
-        filename = os.path.join(download_dir, pdf_url.split('/')[-1].split('?')[0])
-        # Clean filename
-        filename = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
+    def _supports_ranged_download(self, headers):
+        """Whether response headers show a large, unencoded file the server will serve in ranges."""
+        return (headers.get('Accept-Ranges', '').lower() == 'bytes'
+                and headers.get('Content-Encoding', 'identity').lower() == 'identity'
+                and int(headers.get('Content-Length', 0)) > self.RANGED_DOWNLOAD_THRESHOLD)
+    
+    def _download_ranged(self, pdf_url, filename, session, headers, parts=None):
+        """Download a large PDF as parallel byte ranges.
+        
+        headers are the headers of a response we already have for pdf_url, used
+        to check that ranges are supported and to get the file size. Returns
+        False without downloading anything useful if the file is small or the
+        server does not honour range requests, so the caller can fall back.
+        """
+        if parts is None:
+            parts = self.RANGED_DOWNLOAD_PARTS
+        if not self._supports_ranged_download(headers):
+            return False
+        size = int(headers['Content-Length'])
+        
+        # Pre-allocate a temporary file so each range can be written in place; it only
+        # replaces the real file once every range has arrived, so a failed or
+        # interrupted download never leaves a full-size file behind
+        part_file = filename + '.part'
+        with open(part_file, 'wb') as f:
+            f.truncate(size)
+        
+        part_size = -(-size // parts)
+        ranges = [(lo, min(lo + part_size, size) - 1) for lo in range(0, size, part_size)]
+        
+        def fetch_range(lo, hi):
+            # Ask for the identity encoding so the byte offsets match the file on disk
+            range_headers = {'Accept-Encoding': 'identity', 'Range': f'bytes={lo}-{hi}'}
+            with session.get(pdf_url, headers=range_headers, stream=True) as response:
+                response.raise_for_status()
+                if response.status_code != 206:  # Server ignored the Range header
+                    return False
+                # Servers may send a different range than requested, which would leave gaps
+                match = self._CONTENT_RANGE_RE.fullmatch(response.headers.get('Content-Range', '').strip())
+                if not match or (int(match[1]), int(match[2])) != (lo, hi) or match[3] not in ('*', str(size)):
+                    return False
+                # Each range gets its own file handle, so no locking is needed
+                response.raw.decode_content = True
+                with open(part_file, 'r+b') as f:
+                    f.seek(lo)
+                    shutil.copyfileobj(response.raw, f, length=self.DOWNLOAD_CHUNK_SIZE)
+                    return f.tell() == hi + 1
+        
+        try:
+            with ThreadPoolExecutor(max_workers=parts) as executor:
+                futures = [executor.submit(fetch_range, lo, hi) for lo, hi in ranges]
+                if all(future.result() for future in futures):
+                    os.replace(part_file, filename)
+                    return True
+        finally:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+        return False
+    
+    def _download_streamed(self, pdf_url, filename, session, try_ranged=True):
+        """Download a PDF over a single streaming GET and return the response headers.
+        
+        If try_ranged is set and the GET's headers show a large file that can be
+        fetched in ranges, the stream is dropped and the parallel ranged download
+        is used instead, so small files never pay for an extra HEAD request.
+        """
+        with session.get(pdf_url, stream=True) as pdf_response:
+            pdf_response.raise_for_status()
+            ranged = try_ranged and self._supports_ranged_download(pdf_response.headers)
+            if not ranged:
+                # Stream straight from the socket in large chunks
+                pdf_response.raw.decode_content = True
+                with open(filename, 'wb') as f:
+                    shutil.copyfileobj(pdf_response.raw, f, length=self.DOWNLOAD_CHUNK_SIZE)
+                return pdf_response.headers
+        
+        if self._download_ranged(pdf_url, filename, session, pdf_response.headers):
+            return pdf_response.headers
+        return self._download_streamed(pdf_url, filename, session, try_ranged=False)
+    
+    def _is_up_to_date(self, pdf_url, filename, session, entry):
+        """Check whether an existing download still matches the remote file.
+        
+        entry is the manifest record from the previous download, if any; its
+        validators make the HEAD conditional so the server can answer 304.
+        Returns (up to date, HEAD headers or None if the HEAD wasn't a 200) so
+        the headers can be reused to plan the download.
+        """
+        headers = {'Accept-Encoding': 'identity'}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        
+        local_size = os.path.getsize(filename)
+        head = session.head(pdf_url, headers=headers, allow_redirects=True)
+        head_headers = head.headers if head.status_code == 200 else None
+        if head.status_code == 304:
+            return entry.get('size') == local_size, head_headers
+        if not head.ok:
+            return False, head_headers
+        
+        remote_size = int(head.headers.get('Content-Length', -1))
+        if 'If-None-Match' in headers or 'If-Modified-Since' in headers:
+            # Some servers ignore conditional HEADs and answer 200, so compare the validators ourselves
+            same_validators = all(
+                entry.get(key) is None or entry[key] == head.headers.get(header)
+                for key, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified'))
+            )
+            return same_validators and remote_size == local_size == entry.get('size'), head_headers
+        return remote_size == local_size, head_headers
+    
+    def _load_manifest(self, download_dir):
+        """Load the record of previous downloads kept in download_dir."""
+        try:
+            with open(os.path.join(download_dir, self.MANIFEST_NAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self, download_dir, manifest):
+        """Write the record of downloads back to download_dir."""
+        try:
+            with open(os.path.join(download_dir, self.MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f, indent=2)
+        except OSError as e:
+            print(f"Warning: Could not save download manifest: {e}")
+    
+    def download_pdf(self, pdf_url, download_dir, session=None, manifest=None):
+        """Download a single PDF file (retries are handled by the session adapter).
+        
+        Files that are already in download_dir and unchanged on the server are
+        skipped. If a manifest dict is given, it is updated with the validators
+        (ETag, Last-Modified, size) of the file.
+        """
+        if session is None:
+            session = self.session
+        if manifest is None:
+            manifest = {}
+        
+        # Get the filename from the URL and clean it (leaving the directory untouched)
+        filename = self._FILENAME_SANITIZE.sub('_', pdf_url.split('/')[-1].split('?')[0])
         if not filename.lower().endswith('.pdf'):
             filename += '.pdf'
+        filename = os.path.join(download_dir, filename)
         
-        retry_count = 0
-        while retry_count < num_retries:
-            try:
-                # Download the PDF
-                pdf_response = session.get(pdf_url, stream=True)
-                pdf_response.raise_for_status()
-                
-                with open(filename, 'wb') as f:
-                    for chunk in pdf_response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                return True, filename
-            except requests.RequestException as e:
-                retry_count += 1
-                if retry_count < num_retries:
-                    print(f"Error downloading {pdf_url}: {e}. Retrying ({retry_count}/{num_retries})...")
-                    time.sleep(2)  # Wait before retrying
-                else:
-                    print(f"Failed to download {pdf_url} after {num_retries} attempts: {e}")
-                    return False, None
-            except Exception as e:
-                print(f"Error processing {pdf_url}: {e}")
-                return False, None
+        try:
+            # Skip files we already have, so re-runs only fetch what changed
+            head_headers = None
+            if os.path.exists(filename):
+                up_to_date, head_headers = self._is_up_to_date(pdf_url, filename, session, manifest.get(pdf_url, {}))
+                if up_to_date:
+                    self._progress(f"Already downloaded: {os.path.basename(filename)}")
+                    return True, filename
+            
+            # Large files are split into parallel range requests when supported, planned
+            # from the HEAD we already made if there was one, otherwise from the GET
+            if head_headers is not None and self._download_ranged(pdf_url, filename, session, head_headers):
+                response_headers = head_headers
+            else:
+                response_headers = self._download_streamed(pdf_url, filename, session,
+                                                           try_ranged=head_headers is None)
+            
+            # Validators of an encoded response (e.g. Apache's "abc-gzip" ETags) never match
+            # the identity-encoded HEAD used by the up-to-date check, so record those instead
+            if response_headers.get('Content-Encoding', 'identity').lower() != 'identity':
+                response_headers = session.head(pdf_url, headers={'Accept-Encoding': 'identity'},
+                                                allow_redirects=True).headers
+            
+            manifest[pdf_url] = {
+                'etag': response_headers.get('ETag'),
+                'last_modified': response_headers.get('Last-Modified'),
+                'size': os.path.getsize(filename),
+            }
+            return True, filename
+        except requests.RequestException as e:
+            print(f"Failed to download {pdf_url}: {e}")
+            return False, None
+        except Exception as e:
+            print(f"Error processing {pdf_url}: {e}")
+            return False, None
     
     def download_pdfs_from_url(self, target_url, download_dir=None, max_workers=10):
         """Download all PDF files from a given URL."""
@@ -67,72 +365,69 @@ class PDFTools:
         start_time = time.time()
         
         try:
-            # Create a session for better performance
-            with requests.Session() as session:
-                session.headers.update(self.headers)
-                
-                # Fetch the webpage
-                print("Fetching webpage...")
-                response = session.get(target_url)
-                response.raise_for_status()
-                
-                # Parse HTML content
-                print("Parsing HTML content...")
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Find all links
-                pdf_urls = []
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    
-                    # Check if it's a PDF link
-                    if re.search(r'\.pdf(?:$|\?)', href, re.IGNORECASE):
-                        # Convert relative URLs to absolute URLs
-                        full_url = urljoin(target_url, href)
-                        pdf_urls.append(full_url)
-                
-                # Remove duplicates
-                pdf_urls = list(set(pdf_urls))
-                
-                print(f"Found {len(pdf_urls)} unique PDF links on the page.")
-                
-                if not pdf_urls:
-                    print("No PDF links found. Please check the website structure.")
-                    return None
-                
-                # Download PDFs in parallel
-                print(f"Downloading {len(pdf_urls)} PDF files to {download_dir}...")
-                
-                successful_downloads = 0
-                failed_downloads = 0
+            # Fetch the webpage
+            print("Fetching webpage...")
+            response = self.session.get(target_url)
+            response.raise_for_status()
+            
+            # Parse HTML content
+            print("Parsing HTML content...")
+            try:
+                tree = lxml.html.fromstring(response.content)
+            except lxml.etree.ParserError:
+                tree = None  # Empty page, so there are no links to find
+            
+            # Find all PDF links, converting relative URLs to absolute ones and
+            # removing duplicates as we go
+            hrefs = []
+            if tree is not None:
+                hrefs = tree.xpath(self._PDF_HREF_XPATH, namespaces={'re': 'http://exslt.org/regular-expressions'})
+            pdf_urls = list({urljoin(target_url, href) for href in hrefs})
+            
+            print(f"Found {len(pdf_urls)} unique PDF links on the page.")
+            
+            if not pdf_urls:
+                print("No PDF links found. Please check the website structure.")
+                return None
+            
+            # Download PDFs in parallel
+            print(f"Downloading {len(pdf_urls)} PDF files to {download_dir}...")
+            
+            successful_downloads = 0
+            failed_downloads = 0
+            
+            manifest = self._load_manifest(download_dir)
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_url = {
+                    executor.submit(self.download_pdf, url, download_dir, self.session, manifest): url 
+                    for url in pdf_urls
+                }
                 
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    future_to_url = {
-                        executor.submit(self.download_pdf, url, download_dir, session): url 
-                        for url in pdf_urls
-                    }
-                    
-                    for i, future in enumerate(as_completed(future_to_url), 1):
-                        url = future_to_url[future]
-                        try:
-                            success, filename = future.result()
-                            if success:
-                                successful_downloads += 1
-                                print(f"Progress: [{i}/{len(pdf_urls)}] Downloaded: {os.path.basename(filename)}")
-                            else:
-                                failed_downloads += 1
-                                print(f"Progress: [{i}/{len(pdf_urls)}] Failed to download: {url}")
-                        except Exception as e:
+                for i, future in enumerate(as_completed(future_to_url), 1):
+                    # Drop finished entries so completed futures can be freed
+                    url = future_to_url.pop(future)
+                    try:
+                        success, filename = future.result()
+                        if success:
+                            successful_downloads += 1
+                            self._progress(f"Progress: [{i}/{len(pdf_urls)}] Downloaded: {os.path.basename(filename)}")
+                        else:
                             failed_downloads += 1
-                            print(f"Progress: [{i}/{len(pdf_urls)}] Error processing {url}: {e}")
-                
-                elapsed_time = time.time() - start_time
-                print(f"\nDownload complete in {elapsed_time:.2f} seconds!")
-                print(f"Successfully downloaded: {successful_downloads} files")
-                print(f"Failed downloads: {failed_downloads} files")
-                print(f"All files saved to: {download_dir}")
-                
-                return download_dir
+                            print(f"Progress: [{i}/{len(pdf_urls)}] Failed to download: {url}")
+                    except Exception as e:
+                        failed_downloads += 1
+                        print(f"Progress: [{i}/{len(pdf_urls)}] Error processing {url}: {e}")
+            
+            self._save_manifest(download_dir, manifest)
+            
+            elapsed_time = time.time() - start_time
+            print(f"\nDownload complete in {elapsed_time:.2f} seconds!")
+            print(f"Successfully downloaded: {successful_downloads} files")
+            print(f"Failed downloads: {failed_downloads} files")
+            print(f"All files saved to: {download_dir}")
+            
+            return download_dir
         
         except requests.RequestException as e:
             print(f"Error fetching webpage {target_url}: {e}")
@@ -143,47 +438,138 @@ class PDFTools:
     
     # ==================== PDF ANALYSIS FUNCTIONS ====================
     
-    def get_pdf_size_info(self, pdf_path):
-        """Get the file size and number of pages for a PDF."""
+    def get_pdf_size_info(self, pdf_path, file_size=None):
+        """Get the file size of a PDF, or 0 if it doesn't look like a PDF."""
         try:
-            file_size = os.path.getsize(pdf_path)
+            # A header check is enough to weed out broken downloads without parsing the file.
+            # Readers tolerate junk before the header as long as it's within the first 1024 bytes.
             with open(pdf_path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                num_pages = len(reader.pages)
-            return file_size, num_pages, pdf_path
+                if b'%PDF-' not in f.read(1024):
+                    print(f"Skipping {pdf_path}: not a PDF file")
+                    return 0, pdf_path
+            if file_size is None:
+                file_size = os.path.getsize(pdf_path)
+            return file_size, pdf_path
         except Exception as e:
             print(f"Error analyzing {pdf_path}: {str(e)}")
-            return 0, 0, pdf_path
+            return 0, pdf_path
     
     # ==================== MERGE FUNCTIONS ====================
     
     def merge_pdf_bucket(self, bucket, output_file):
         """Merge a bucket of PDFs into a single file."""
-        pdf_merger = PyPDF2.PdfMerger()
-        merged_count = 0
+        # Fast path: let the qpdf binary copy pages structurally without touching Python
+        if shutil.which('qpdf'):
+            cmd = ['qpdf', '--empty', '--pages', *bucket, '--', output_file]
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode in (0, 3):  # 3 means success with warnings
+                self._progress(f"Created: {output_file} with {len(bucket)} PDFs")
+                return True
+            print(f"qpdf could not merge {output_file}, falling back to pikepdf")
         
-        for pdf_file in bucket:
-            try:
-                pdf_merger.append(pdf_file)
-                merged_count += 1
-            except Exception as e:
-                print(f"Error adding {pdf_file} to {output_file}: {str(e)}")
+        merged_count = 0
+        part_files = []
+        save_options = dict(linearize=False,
+                            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                            stream_decode_level=pikepdf.StreamDecodeLevel.none)
         
-        if merged_count > 0:
-            try:
-                pdf_merger.write(output_file)
-                pdf_merger.close()
-                print(f"Created: {output_file} with {merged_count} PDFs")
-                return True
-            except Exception as e:
-                print(f"Error writing {output_file}: {str(e)}")
-        else:
-            print(f"No valid PDFs to merge for {output_file}")
+        try:
+            # Write each group of inputs to its own intermediate file so only a handful
+            # of sources are open at once, then join the intermediates in a single pass.
+            for start in range(0, len(bucket), self.MERGE_FLUSH_EVERY):
+                with contextlib.ExitStack() as stack:
+                    group_pdf = stack.enter_context(pikepdf.Pdf.new())
+                    added = 0
+                    for pdf_file in bucket[start:start + self.MERGE_FLUSH_EVERY]:
+                        try:
+                            src = stack.enter_context(pikepdf.Pdf.open(pdf_file))
+                            group_pdf.pages.extend(src.pages)
+                            added += 1
+                        except Exception as e:
+                            print(f"Error adding {pdf_file} to {output_file}: {str(e)}")
+                    
+                    if not added:
+                        continue
+                    
+                    part_file = f"{output_file}.part{start}"
+                    part_files.append(part_file)
+                    group_pdf.save(part_file, **save_options)
+                merged_count += added
+            
+            if merged_count == 0:
+                print(f"No valid PDFs to merge for {output_file}")
+                return False
+            
+            if len(part_files) == 1:
+                os.replace(part_files[0], output_file)
+            else:
+                with contextlib.ExitStack() as stack:
+                    pdf_merger = stack.enter_context(pikepdf.Pdf.new())
+                    for part_file in part_files:
+                        part = stack.enter_context(pikepdf.Pdf.open(part_file))
+                        pdf_merger.pages.extend(part.pages)
+                    pdf_merger.save(output_file, **save_options)
+            self._progress(f"Created: {output_file} with {merged_count} PDFs")
+            return True
+        except Exception as e:
+            print(f"Error writing {output_file}: {str(e)}")
+        finally:
+            for part_file in part_files:
+                if os.path.exists(part_file):
+                    os.remove(part_file)
         
         return False
     
-    def merge_pdfs(self, pdf_dir=None, output_dir="Merged_PDFs", num_output_files=250):
-        """Merge PDFs into a specified number of evenly-sized output files."""
+    def _pack_by_count(self, valid_pdfs, num_output_files):
+        """Distribute (size, path) pairs, largest first, over a fixed number of even buckets."""
+        # Strategy: Use a greedy algorithm to distribute files evenly
+        # Create empty buckets
+        buckets = [[] for _ in range(num_output_files)]
+        
+        # Min-heap of (total size, bucket index) so the smallest bucket is found in O(log k)
+        heap = [(0, i) for i in range(num_output_files)]
+        heapq.heapify(heap)
+        
+        # Assign each file to the bucket with the smallest current total size
+        for file_size, file_path in valid_pdfs:
+            current_size, min_idx = heapq.heappop(heap)
+            buckets[min_idx].append(file_path)
+            heapq.heappush(heap, (current_size + file_size, min_idx))
+        
+        return buckets
+    
+    def _pack_by_size(self, valid_pdfs, max_bucket_bytes):
+        """Pack (size, path) pairs, largest first, into buckets of at most max_bucket_bytes.
+        
+        Uses best-fit decreasing: each file goes into the fullest bucket that still
+        has room for it, or a new bucket if none does. Files larger than the limit
+        get a bucket of their own.
+        """
+        buckets = []
+        # (remaining bytes, bucket index) for every bucket with room left, kept sorted
+        open_buckets = []
+        
+        for file_size, file_path in valid_pdfs:
+            pos = bisect.bisect_left(open_buckets, (file_size, -1))
+            if pos < len(open_buckets):
+                remaining, idx = open_buckets.pop(pos)
+            else:
+                remaining, idx = max_bucket_bytes, len(buckets)
+                buckets.append([])
+            
+            buckets[idx].append(file_path)
+            remaining -= file_size
+            if remaining > 0:
+                bisect.insort(open_buckets, (remaining, idx))
+        
+        return buckets
+    
+    def merge_pdfs(self, pdf_dir=None, output_dir="Merged_PDFs", num_output_files=250, max_bucket_bytes=None):
+        """Merge PDFs into a specified number of evenly-sized output files.
+        
+        If max_bucket_bytes is given, the number of outputs is chosen instead so
+        that each output stays under that size.
+        """
         start_time = time.time()
         
         # Look for the directory with the downloaded PDFs if not specified
@@ -196,8 +582,9 @@ class PDFTools:
         
         print(f"Using PDF directory: {pdf_dir}")
         
-        # Get all PDF files in the directory
-        all_files = [os.path.join(pdf_dir, f) for f in os.listdir(pdf_dir) if f.lower().endswith('.pdf')]
+        # Get all PDF files in the directory, reusing the sizes scandir already fetched
+        all_files = [(e.path, e.stat().st_size) for e in os.scandir(pdf_dir)
+                     if e.is_file() and e.name.lower().endswith('.pdf')]
         
         if not all_files:
             print(f"No PDF files found in {pdf_dir}.")
@@ -205,14 +592,9 @@ class PDFTools:
         
         print(f"Found {len(all_files)} PDF files. Analyzing...")
         
-        # Filter for valid PDFs and get their info in parallel
-        valid_pdfs = []
-        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-            futures = [executor.submit(self.get_pdf_size_info, pdf_file) for pdf_file in all_files]
-            for future in as_completed(futures):
-                file_size, num_pages, pdf_path = future.result()
-                if file_size > 0:  # Valid PDFs have size > 0
-                    valid_pdfs.append((file_size, num_pages, pdf_path))
+        # Filter for valid PDFs (valid PDFs have size > 0)
+        size_info = [self.get_pdf_size_info(pdf_file, file_size) for pdf_file, file_size in all_files]
+        valid_pdfs = [(file_size, pdf_path) for file_size, pdf_path in size_info if file_size > 0]
         
         print(f"Found {len(valid_pdfs)} valid PDFs")
         
@@ -223,24 +605,18 @@ class PDFTools:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Calculate how many files to create (at most the requested number, but could be fewer)
-        num_output_files = min(num_output_files, len(valid_pdfs))
-        print(f"Will create up to {num_output_files} merged PDF files")
-        
-        # Strategy: Use a greedy algorithm to distribute files evenly
-        # Create empty buckets
-        buckets = [[] for _ in range(num_output_files)]
-        bucket_sizes = [0] * num_output_files
-        
         # Sort files by size (largest first)
         valid_pdfs.sort(reverse=True)
         
-        # Assign each file to the bucket with the smallest current total size
-        for file_size, num_pages, file_path in valid_pdfs:
-            # Find the bucket with the smallest total size
-            min_idx = bucket_sizes.index(min(bucket_sizes))
-            buckets[min_idx].append(file_path)
-            bucket_sizes[min_idx] += file_size
+        if max_bucket_bytes:
+            # Pack files into as few outputs as possible, each under the size limit
+            buckets = self._pack_by_size(valid_pdfs, max_bucket_bytes)
+            print(f"Will create {len(buckets)} merged PDF files of at most {max_bucket_bytes/_MB:.2f}MB each")
+        else:
+            # Calculate how many files to create (at most the requested number, but could be fewer)
+            num_output_files = min(num_output_files, len(valid_pdfs))
+            print(f"Will create up to {num_output_files} merged PDF files")
+            buckets = self._pack_by_count(valid_pdfs, num_output_files)
         
         # Now merge PDFs in each bucket
         successfully_merged = 0
@@ -261,45 +637,181 @@ class PDFTools:
     
     # ==================== COMPRESSION FUNCTIONS ====================
     
-    def compress_pdf(self, input_file, output_file, quality='screen'):
-        """Compress a PDF file using Ghostscript."""
-        quality_settings = {
-            'screen': '/screen',  # 72 dpi - lowest quality, smallest size
-            'ebook': '/ebook',    # 150 dpi - medium quality, good size
-            'printer': '/printer',  # 300 dpi - better quality, larger size
-            'prepress': '/prepress'  # 300 dpi - best quality, largest size
-        }
+    def _compress_command(self, input_file, output_file, quality):
+        """Build the Ghostscript command line for compressing a single PDF."""
+        gs_setting = self.QUALITY_SETTINGS.get(quality, '/ebook')
+        return [
+            'gs', '-sDEVICE=pdfwrite', '-dCompatibilityLevel=1.4',
+            f'-dPDFSETTINGS={gs_setting}', '-dNOPAUSE', '-dQUIET', '-dBATCH',
+            f'-sOutputFile={output_file}', input_file
+        ]
+    
+    def _pdfwrite_args(self, jobs, quality):
+        """Ghostscript pdfwrite arguments that may read and write every file in jobs."""
+        gs_setting = self.QUALITY_SETTINGS.get(quality, '/ebook')
         
-        gs_setting = quality_settings.get(quality, '/ebook')
+        # Allow the PostScript driver to read the inputs and write the outputs under -dSAFER
+        read_dirs = {os.path.join(os.path.dirname(input_file), '') for input_file, _ in jobs}
+        write_dirs = {os.path.join(os.path.dirname(output_file), '') for _, output_file in jobs}
         
+        return [
+            'gs', '-sDEVICE=pdfwrite', '-dCompatibilityLevel=1.4',
+            f'-dPDFSETTINGS={gs_setting}', '-dNOPAUSE', '-dQUIET', '-dBATCH',
+            *[f'--permit-file-read={d}' for d in sorted(read_dirs)],
+            *[f'--permit-file-write={d}' for d in sorted(write_dirs)],
+        ]
+    
+    def _batch_command(self, jobs, quality, program_file):
+        """Build a Ghostscript command line that compresses several PDFs in one process.
+        
+        After each input is run, the pdfwrite device is pointed at the next
+        output file, so Ghostscript's startup cost is paid once per batch. The
+        driver program is written to program_file rather than passed with -c,
+        since a large batch would exceed the OS limit on a single argument.
+        """
+        jobs = _absolute_jobs(jobs)
+        with open(program_file, 'wb') as f:
+            for input_file, output_file in jobs:
+                f.write(os.fsencode(
+                    f'<< /OutputFile {_ps_string(output_file)} >> setpagedevice {_ps_string(input_file)} run\n'
+                ))
+        return self._pdfwrite_args(jobs, quality) + [f'-sOutputFile={jobs[0][1]}', program_file]
+    
+    def _warm_ghostscript(self):
+        """Start Ghostscript once so its font discovery is done before the workers start.
+        
+        The first run builds the system font cache (fontconfig) and pulls gs's
+        resources into the OS page cache; without this every parallel worker
+        would do that work at the same time.
+        """
+        if self._gs_warmed:
+            return
+        self._gs_warmed = True
         try:
-            cmd = [
-                'gs', '-sDEVICE=pdfwrite', '-dCompatibilityLevel=1.4',
-                f'-dPDFSETTINGS={gs_setting}', '-dNOPAUSE', '-dQUIET', '-dBATCH',
-                f'-sOutputFile={output_file}', input_file
-            ]
-            
-            subprocess.run(cmd, check=True)
-            
-            original_size = os.path.getsize(input_file)
-            compressed_size = os.path.getsize(output_file)
-            reduction = (1 - compressed_size / original_size) * 100
-            
-            print(f"Compressed {os.path.basename(input_file)} from {original_size/1024/1024:.2f}MB to {compressed_size/1024/1024:.2f}MB ({reduction:.2f}% reduction)")
-            return True, original_size, compressed_size
+            subprocess.run(['gs', '-q', '-dNODISPLAY', '-dNOPAUSE', '-dBATCH', '-c', 'quit'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            pass  # Missing gs is reported by the compression itself
+    
+    def compress_pdf(self, input_file, output_file, quality='screen', input_size=None):
+        """Compress a PDF file using Ghostscript.
+        
+        input_size may be passed when the caller already knows it, to save a stat.
+        """
+        try:
+            subprocess.run(self._compress_command(input_file, output_file, quality), check=True)
+            return self._report_compression(input_file, output_file, input_size)
         except subprocess.CalledProcessError as e:
-            print(f"Error compressing {input_file}: {str(e)}")
-            # If compression fails, copy the original file
-            shutil.copy(input_file, output_file)
-            original_size = os.path.getsize(input_file)
-            return False, original_size, original_size
+            return self._compression_failed(input_file, output_file, e, input_size)
+    
+    async def _run_gs_async(self, cmd):
+        """Run a Ghostscript command without tying up a thread while it runs."""
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=subprocess.DEVNULL)
+        returncode = await proc.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd)
+    
+    async def compress_pdf_async(self, input_file, output_file, quality='screen', input_size=None):
+        """Compress a PDF file using Ghostscript from the event loop."""
+        try:
+            await self._run_gs_async(self._compress_command(input_file, output_file, quality))
+            return self._report_compression(input_file, output_file, input_size)
+        except (subprocess.CalledProcessError, OSError) as e:
+            return self._compression_failed(input_file, output_file, e, input_size)
+    
+    async def compress_pdf_batch(self, jobs, quality='screen', executor=None, input_sizes=None):
+        """Compress several PDFs with a single Ghostscript interpreter.
+        
+        Uses the in-process libgs binding when it is installed and executor is a
+        ProcessPoolExecutor (each worker process owns one interpreter), otherwise a
+        single gs process for the whole batch. input_sizes optionally maps input
+        paths to their already-known sizes.
+        """
+        if input_sizes is None:
+            input_sizes = {}
+        
+        # libgs interpreters can't be shared between threads, so only use them in worker processes
+        if gsapi is not None and isinstance(executor, ProcessPoolExecutor):
+            abs_jobs = _absolute_jobs(jobs)
+            init_args = self._pdfwrite_args(abs_jobs, quality) + [f'-sOutputFile={os.devnull}']
+            loop = asyncio.get_running_loop()
+            outcomes = await loop.run_in_executor(executor, _compress_batch_libgs, abs_jobs, init_args)
+            if outcomes is not None:
+                results = []
+                for (input_file, output_file), ok in zip(jobs, outcomes):
+                    input_size = input_sizes.get(input_file)
+                    if not ok:
+                        results.append(self._compression_failed(input_file, output_file,
+                                                                "Ghostscript reported an error", input_size))
+                        continue
+                    try:
+                        results.append(self._report_compression(input_file, output_file, input_size))
+                    except OSError:
+                        # libgs finished without writing the output, so retry with the gs binary
+                        results.append(await self.compress_pdf_async(input_file, output_file, quality, input_size))
+                return results
+            # libgs couldn't create an interpreter here, so use the gs binary instead
+        
+        fd, program_file = tempfile.mkstemp(suffix='.ps')
+        os.close(fd)
+        try:
+            await self._run_gs_async(self._batch_command(jobs, quality, program_file))
+            return [self._report_compression(input_file, output_file, input_sizes.get(input_file))
+                    for input_file, output_file in jobs]
+        except (subprocess.CalledProcessError, OSError) as e:
+            # We can't tell which file broke the batch, so redo them one at a time
+            reason = f"exit status {e.returncode}" if isinstance(e, subprocess.CalledProcessError) else str(e)
+            print(f"Ghostscript failed on a batch of {len(jobs)} files ({reason}), retrying individually...")
+            return [await self.compress_pdf_async(input_file, output_file, quality, input_sizes.get(input_file))
+                    for input_file, output_file in jobs]
+        finally:
+            os.remove(program_file)
     
-    def super_compress_pdf(self, input_file, output_file):
+    async def _compress_batches(self, batches, quality, max_workers, input_sizes=None):
+        """Compress batches concurrently, running at most max_workers Ghostscript interpreters."""
+        sem = asyncio.Semaphore(max_workers)
+        # libgs calls block and an interpreter can't be shared across threads, so they run
+        # in worker processes that each keep their own interpreter and use their own core
+        executor = ProcessPoolExecutor(max_workers=max_workers) if gsapi is not None else None
+        
+        async def compress_one(batch):
+            async with sem:
+                return await self.compress_pdf_batch(batch, quality, executor, input_sizes)
+        
+        try:
+            return await asyncio.gather(*(compress_one(batch) for batch in batches), return_exceptions=True)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _compression_failed(self, input_file, output_file, error, input_size=None):
+        """Fall back to copying the original file when compression fails."""
+        print(f"Error compressing {input_file}: {str(error)}")
+        shutil.copy(input_file, output_file)
+        original_size = input_size if input_size is not None else os.path.getsize(input_file)
+        return False, original_size, original_size
+    
+    def _report_compression(self, input_file, output_file, input_size=None):
+        """Print and return the size reduction achieved for a compressed file."""
+        original_size = input_size if input_size is not None else os.path.getsize(input_file)
+        compressed_size = os.path.getsize(output_file)
+        
+        if self.verbose:
+            reduction = (1 - compressed_size / original_size) * 100
+            print(f"Compressed {os.path.basename(input_file)} from {original_size/_MB:.2f}MB to {compressed_size/_MB:.2f}MB ({reduction:.2f}% reduction)")
+        return True, original_size, compressed_size
+    
+    def super_compress_pdf(self, input_file, output_file, input_size=None):
         """Aggressively compress a PDF file to make it smaller than 100MB."""
-        print(f"Aggressively compressing {os.path.basename(input_file)}...")
+        self._progress(f"Aggressively compressing {os.path.basename(input_file)}...")
+        
+        original_size = input_size if input_size is not None else os.path.getsize(input_file)
+        original_size_mb = original_size / _MB
         
-        original_size = os.path.getsize(input_file)
-        original_size_mb = original_size / (1024 * 1024)
+        # Already under the limit, so the regular compression pass is enough
+        if original_size_mb < 100:
+            _, _, compressed_size = self.compress_pdf(input_file, output_file, 'screen', original_size)
+            return True, compressed_size / _MB
         
         # First attempt: Strong compression with low resolution
         cmd = [
@@ -323,15 +835,15 @@ class PDFTools:
         try:
             subprocess.run(cmd, check=True)
             compressed_size = os.path.getsize(output_file)
-            compressed_size_mb = compressed_size / (1024 * 1024)
+            compressed_size_mb = compressed_size / _MB
             reduction = (1 - compressed_size / original_size) * 100
             
-            print(f"Compressed from {original_size_mb:.2f}MB to {compressed_size_mb:.2f}MB ({reduction:.2f}% reduction)")
+            self._progress(f"Compressed from {original_size_mb:.2f}MB to {compressed_size_mb:.2f}MB ({reduction:.2f}% reduction)")
             
             # If still over 100MB, try more aggressive compression
             if compressed_size_mb > 100:
-                print(f"File still over 100MB, trying more aggressive compression...")
-                more_aggressive_output = output_file.replace('.pdf', '_more_compressed.pdf')
+                self._progress(f"File still over 100MB, trying more aggressive compression...")
+                more_aggressive_output = os.path.splitext(output_file)[0] + '_more_compressed.pdf'
                 
                 # More aggressive compression with grayscale conversion
                 cmd2 = [
@@ -350,26 +862,26 @@ class PDFTools:
                     '-dEmbedAllFonts=false',
                     '-dNOPAUSE', '-dQUIET', '-dBATCH',
                     f'-sOutputFile={more_aggressive_output}',
-                    input_file
+                    output_file  # Build on the first pass rather than starting over
                 ]
                 
                 subprocess.run(cmd2, check=True)
                 more_compressed_size = os.path.getsize(more_aggressive_output)
-                more_compressed_size_mb = more_compressed_size / (1024 * 1024)
+                more_compressed_size_mb = more_compressed_size / _MB
                 more_reduction = (1 - more_compressed_size / original_size) * 100
                 
-                print(f"More aggressive compression: {original_size_mb:.2f}MB to {more_compressed_size_mb:.2f}MB ({more_reduction:.2f}% reduction)")
+                self._progress(f"More aggressive compression: {original_size_mb:.2f}MB to {more_compressed_size_mb:.2f}MB ({more_reduction:.2f}% reduction)")
                 
                 # Use the smallest file
                 if more_compressed_size < compressed_size:
-                    print(f"Using more aggressive compression result")
+                    self._progress(f"Using more aggressive compression result")
                     os.remove(output_file)
                     os.rename(more_aggressive_output, output_file)
                     compressed_size = more_compressed_size
                     compressed_size_mb = more_compressed_size_mb
                     reduction = more_reduction
                 else:
-                    print(f"Original compression was better, keeping that one")
+                    self._progress(f"Original compression was better, keeping that one")
                     if os.path.exists(more_aggressive_output):
                         os.remove(more_aggressive_output)
             
@@ -388,8 +900,9 @@ class PDFTools:
             print(f"Input directory '{input_dir}' not found.")
             return None
         
-        # Get all PDF files in the directory
-        pdf_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.pdf')]
+        # Get all PDF files in the directory along with their sizes
+        pdf_files = [(e.name, e.stat().st_size) for e in os.scandir(input_dir)
+                     if e.is_file() and e.name.lower().endswith('.pdf')]
         
         if not pdf_files:
             print(f"No PDF files found in {input_dir}.")
@@ -400,63 +913,63 @@ class PDFTools:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
+        # Warm up Ghostscript once before compressing in parallel
+        self._warm_ghostscript()
+        
         # Track total sizes
         total_original_size = 0
         total_compressed_size = 0
         successfully_compressed = 0
         
-        # Check for large files first
+        # Split into large files (over 100MB) and regular files in a single pass
         large_pdfs = []
-        for filename in pdf_files:
+        regular_pdfs = []
+        # Keep the sizes from the scandir pass so compression doesn't need to stat the inputs again
+        input_sizes = {}
+        for filename, file_size in pdf_files:
             filepath = os.path.join(input_dir, filename)
-            size_mb = os.path.getsize(filepath) / (1024 * 1024)
-            if size_mb > 100:
-                large_pdfs.append((filepath, size_mb))
+            input_sizes[filepath] = file_size
+            if file_size > 100 * _MB:
+                large_pdfs.append(filepath)
+            else:
+                regular_pdfs.append(filename)
         
         # Process large files with super compression
         if large_pdfs:
             print(f"Found {len(large_pdfs)} PDFs over 100MB, applying aggressive compression...")
-            for pdf_path, size in large_pdfs:
+            for pdf_path in large_pdfs:
                 filename = os.path.basename(pdf_path)
                 output_path = os.path.join(output_dir, filename)
+                size = input_sizes[pdf_path]
                 
-                print(f"\nProcessing large file: {filename} ({size:.2f}MB)")
-                result, final_size = self.super_compress_pdf(pdf_path, output_path)
+                self._progress(f"\nProcessing large file: {filename} ({size/_MB:.2f}MB)")
+                result, final_size = self.super_compress_pdf(pdf_path, output_path, size)
                 
                 if result:
-                    print(f"Successfully compressed {filename} to under 100MB: {final_size:.2f}MB")
+                    self._progress(f"Successfully compressed {filename} to under 100MB: {final_size:.2f}MB")
                 else:
                     print(f"Warning: Could not compress {filename} below 100MB limit. Final size: {final_size:.2f}MB")
         
         # Regular compression for the rest of the files
-        regular_pdfs = [f for f in pdf_files if os.path.join(input_dir, f) not in [p[0] for p in large_pdfs]]
-        
         if not max_workers:
             max_workers = min(os.cpu_count(), 4)  # Limit to 4 workers by default to avoid memory issues
         
-        # Process files in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Create future to result mapping
-            future_to_file = {}
-            
-            # Submit compression tasks
-            for pdf_file in regular_pdfs:
-                input_path = os.path.join(input_dir, pdf_file)
-                output_path = os.path.join(output_dir, pdf_file)
-                future = executor.submit(self.compress_pdf, input_path, output_path, quality)
-                future_to_file[future] = input_path
-            
-            # Process results as they complete
-            for future in as_completed(future_to_file):
-                input_path = future_to_file[future]
-                try:
-                    success, original_size, compressed_size = future.result()
-                    total_original_size += original_size
-                    total_compressed_size += compressed_size
-                    if success:
-                        successfully_compressed += 1
-                except Exception as e:
-                    print(f"Error processing {input_path}: {str(e)}")
+        # Split the files into one batch per worker so each worker starts Ghostscript once
+        jobs = [(os.path.join(input_dir, f), os.path.join(output_dir, f)) for f in regular_pdfs]
+        batches = [jobs[i::max_workers] for i in range(max_workers) if jobs[i::max_workers]]
+        
+        # Process batches concurrently from a single event loop thread
+        results = asyncio.run(self._compress_batches(batches, quality, max_workers, input_sizes))
+        
+        for batch, batch_results in zip(batches, results):
+            if isinstance(batch_results, Exception):
+                print(f"Error processing batch starting with {batch[0][0]}: {str(batch_results)}")
+                continue
+            for success, original_size, compressed_size in batch_results:
+                total_original_size += original_size
+                total_compressed_size += compressed_size
+                if success:
+                    successfully_compressed += 1
         
         elapsed_time = time.time() - start_time
         
@@ -464,8 +977,8 @@ class PDFTools:
         if total_original_size > 0:
             total_reduction = (1 - total_compressed_size / total_original_size) * 100
             print(f"\nTotal size reduction: {total_reduction:.2f}%")
-            print(f"Original total size: {total_original_size/1024/1024/1024:.2f}GB")
-            print(f"Compressed total size: {total_compressed_size/1024/1024/1024:.2f}GB")
+            print(f"Original total size: {total_original_size/_GB:.2f}GB")
+            print(f"Compressed total size: {total_compressed_size/_GB:.2f}GB")
         
         print(f"\nCompression completed in {elapsed_time:.2f} seconds!")
         print(f"Successfully compressed {successfully_compressed} out of {len(regular_pdfs)} regular PDF files")
@@ -476,6 +989,7 @@ class PDFTools:
 def main():
     """Main function to handle command line arguments."""
     parser = argparse.ArgumentParser(description='PDF Tools: Download, Merge, and Compress PDF files')
+    parser.add_argument('--quiet', action='store_true', help='Only print summaries, warnings and errors, not per-file progress')
     
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
@@ -491,6 +1005,8 @@ def main():
     merge_parser.add_argument('--input', '-i', help='Input directory containing PDFs')
     merge_parser.add_argument('--output', '-o', default='Merged_PDFs', help='Output directory for merged PDFs')
     merge_parser.add_argument('--count', '-c', type=int, default=250, help='Number of output files to create')
+    merge_parser.add_argument('--max-bucket-bytes', type=int,
+                              help='Pack PDFs into as few files as possible, each at most this many bytes (overrides --count)')
     
     # Compress command
     compress_parser = subparsers.add_parser('compress', help='Compress PDFs to reduce file size')
@@ -505,6 +1021,8 @@ def main():
     all_parser.add_argument('url', help='URL to download PDFs from')
     all_parser.add_argument('--output', '-o', default='Processed_PDFs', help='Final output directory')
     all_parser.add_argument('--count', '-c', type=int, default=250, help='Number of merged files to create')
+    all_parser.add_argument('--max-bucket-bytes', type=int,
+                            help='Pack PDFs into as few merged files as possible, each at most this many bytes (overrides --count)')
     all_parser.add_argument('--quality', '-q', choices=['screen', 'ebook', 'printer', 'prepress'], 
                            default='screen', help='Compression quality (lower = smaller size)')
     all_parser.add_argument('--download-workers', '-dw', type=int, default=10, help='Number of parallel download workers')
@@ -512,14 +1030,19 @@ def main():
     
     args = parser.parse_args()
     
-    # Create PDFTools instance
-    pdf_tools = PDFTools()
+    # Create PDFTools instance, sizing the connection pool to the download workers
+    if args.command == 'download':
+        pdf_tools = PDFTools(max_workers=args.workers, verbose=not args.quiet)
+    elif args.command == 'all':
+        pdf_tools = PDFTools(max_workers=args.download_workers, verbose=not args.quiet)
+    else:
+        pdf_tools = PDFTools(verbose=not args.quiet)
     
     if args.command == 'download':
         pdf_tools.download_pdfs_from_url(args.url, args.output, args.workers)
     
     elif args.command == 'merge':
-        pdf_tools.merge_pdfs(args.input, args.output, args.count)
+        pdf_tools.merge_pdfs(args.input, args.output, args.count, args.max_bucket_bytes)
     
     elif args.command == 'compress':
         pdf_tools.compress_pdf_directory(args.input, args.output, args.quality, args.workers)
@@ -530,7 +1053,7 @@ def main():
         
         if download_dir:
             print("\n=== STEP 2: MERGING PDFs ===")
-            merged_dir = pdf_tools.merge_pdfs(download_dir, "Temp_Merged_PDFs", args.count)
+            merged_dir = pdf_tools.merge_pdfs(download_dir, "Temp_Merged_PDFs", args.count, args.max_bucket_bytes)
             
             if merged_dir:
                 print("\n=== STEP 3: COMPRESSING PDFs ===")